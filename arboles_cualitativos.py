@@ -10,9 +10,10 @@ __author__ = "Julio Waissman"
 __date__ = "enero 2025"
 
 
-import math
 from collections import Counter
 
+from entropia import entropia_conteos
+
 def entrena_arbol(datos, target, clase_default, 
                   max_profundidad=None, acc_nodo=1, min_ejemplos=0):
     """
@@ -113,9 +114,7 @@ def entropia_clase(datos, target):
         La entropía de la clase
     """
     
-    clases = Counter(d[target] for d in datos)
-    total = sum(clases.values())
-    return -sum((c/total) * math.log2(c/total) for c in clases.values())
+    return entropia_conteos(Counter(d[target] for d in datos).values())
 
 def ganancia_informacion(datos, target, atributo, entropia):
     """
@@ -11,9 +11,11 @@ __author__ = "Julio Waissman"
 __date__ = "enero 2025"
 
 
-import math
 import random
 from collections import Counter
+from itertools import repeat
+
+from entropia import entropia_conteos
 
 
 def entrena_arbol(
@@ -24,6 +26,8 @@ def entrena_arbol(
     acc_nodo: float = 1.0,
     min_ejemplos: int = 0,
     variables_seleccionadas=None,
+    ejecutor=None,
+    min_paralelo: int = 1000,
 ):
     """
     Entrena un árbol de desición utilizando el criterio de entropía
@@ -46,6 +50,10 @@ def entrena_arbol(
         El número mínimo de ejemplos para considerar un nodo como hoja
     variables_seleccionadas: int
         El numero de atributos a escoger aleatoriamente. Si es None, se consideran todas las variables, esto aplica para árboles aleatorios y lo tendrán que implementar en la tarea.
+    ejecutor: concurrent.futures.Executor
+        Un pool de procesos (o hilos) para evaluar los atributos en paralelo. Si es None, la evaluación es serial
+    min_paralelo: int
+        El número mínimo de ejemplos en un nodo para usar el ejecutor, en nodos más pequeños se evalúa en serie
 
     Regresa:
     --------
@@ -73,7 +81,9 @@ def entrena_arbol(
     if variables_seleccionadas is not None:
         atributos = random.sample(atributos, variables_seleccionadas)
 
-    variable, valor = selecciona_variable_valor(datos, target, atributos)
+    variable, valor = selecciona_variable_valor(
+        datos, target, atributos, ejecutor, min_paralelo
+    )
     nodo = NodoN(
         terminal=False, clase_default=clase_default, atributo=variable, valor=valor
     )
@@ -85,6 +95,8 @@ def entrena_arbol(
         acc_nodo,
         min_ejemplos,
         variables_seleccionadas,
+        ejecutor,
+        min_paralelo,
     )
     nodo.hijo_mayor = entrena_arbol(
         [d for d in datos if d[variable] >= valor],
@@ -94,11 +106,15 @@ def entrena_arbol(
         acc_nodo,
         min_ejemplos,
         variables_seleccionadas,
+        ejecutor,
+        min_paralelo,
     )
     return nodo
 
 
-def selecciona_variable_valor(datos, target, atributos):
+def selecciona_variable_valor(
+    datos, target, atributos, ejecutor=None, min_paralelo: int = 1000
+):
     """
     Selecciona el atributo y el valor que mejor separa las clases
 
@@ -111,6 +127,10 @@ def selecciona_variable_valor(datos, target, atributos):
         El nombre del atributo que se quiere predecir
     atributos: list(str)
         La lista de atributos a considerar
+    ejecutor: concurrent.futures.Executor
+        Un pool donde se evalúa cada atributo por separado. Si es None, la evaluación es serial
+    min_paralelo: int
+        El número mínimo de ejemplos para usar el ejecutor
 
     Regresa:
     --------
@@ -121,13 +141,21 @@ def selecciona_variable_valor(datos, target, atributos):
     """
 
     entropia = entropia_clase(datos, target)
-    mejor = max(
-        (
-            (a, maxima_ganancia_informacion(datos, target, a, entropia))
-            for a in atributos
-        ),
-        key=lambda x: x[1][1],
-    )
+    if ejecutor is not None and len(datos) >= min_paralelo and len(atributos) > 1:
+        # map regresa los resultados en el orden de los atributos, así que los
+        # empates se rompen igual que en la versión serial
+        ganancias = ejecutor.map(
+            maxima_ganancia_informacion,
+            repeat(datos),
+            repeat(target),
+            atributos,
+            repeat(entropia),
+        )
+    else:
+        ganancias = (
+            maxima_ganancia_informacion(datos, target, a, entropia) for a in atributos
+        )
+    mejor = max(zip(atributos, ganancias), key=lambda x: x[1][1])
     return mejor[0], mejor[1][0]
 
 
@@ -149,9 +177,7 @@ def entropia_clase(datos, target):
         La entropía de la clase
     """
 
-    clases = Counter(d[target] for d in datos)
-    total = sum(clases.values())
-    return -sum((c / total) * math.log2(c / total) for c in clases.values())
+    return entropia_conteos(Counter(d[target] for d in datos).values())
 
 
 def maxima_ganancia_informacion(datos, target, atributo, entropia):
@@ -1,5 +1,7 @@
 import arboles_numericos as an
+import math
 import random
+from collections import Counter
 
 
 def entrena_bosque_aleatorio(
@@ -16,9 +18,11 @@ def entrena_bosque_aleatorio(
 
     # Para cada subconjunto de datos, entrena un árbol
     for subconjunto in subconjuntos:
+        clase_default = Counter(d[target] for d in subconjunto).most_common(1)[0][0]
         arbol = an.entrena_arbol(
             subconjunto,
             target,
+            clase_default,
             max_profundidad,
             acc_nodo,
             min_ejemplos,
@@ -59,3 +63,66 @@ def predice_bosque_aleatorio(
 
     # Escoge la predicción más común
     return max(predicciones, key=predicciones.count)
+
+
+def predice_bosque_temprano(
+    bosque: list[an.NodoN],
+    instancia: dict[str, float | int],
+    margen: float | None = None,
+) -> tuple[any, int]:
+    if len(bosque) == 0:
+        raise ValueError("El bosque no tiene árboles")
+    if margen is not None and not 0 < margen <= 1:
+        raise ValueError(f"El margen debe estar en (0, 1], se recibió {margen}")
+
+    votos: dict[any, int] = {}
+    umbral = None if margen is None else max(1, math.ceil(margen * len(bosque)))
+
+    for evaluados, arbol in enumerate(bosque, start=1):
+        prediccion = arbol.predice(instancia)
+        votos[prediccion] = votos.get(prediccion, 0) + 1
+
+        # El líder es el de más votos; en empate, el que apareció primero
+        # (el mismo criterio que max(predicciones, key=predicciones.count))
+        lider = max(votos, key=votos.get)
+        restantes = len(bosque) - evaluados
+        if restantes == 0:
+            break
+
+        # Modo por confianza: basta con que la ventaja sobre el segundo
+        # alcance el margen (fracción del total de árboles)
+        if umbral is not None:
+            segundo = max((v for c, v in votos.items() if c != lider), default=0)
+            if votos[lider] - segundo >= umbral:
+                break
+
+        # Modo exacto: ninguna otra clase puede alcanzar al líder. Las clases
+        # que aparecieron antes del líder le ganan un empate, las demás
+        # (incluyendo las que no han aparecido) lo pierden
+        decidido = votos[lider] >= restantes
+        antes_del_lider = True
+        for clase, v in votos.items():
+            if clase == lider:
+                antes_del_lider = False
+            elif antes_del_lider:
+                decidido = decidido and votos[lider] > v + restantes
+            else:
+                decidido = decidido and votos[lider] >= v + restantes
+        if decidido:
+            break
+
+    return lider, evaluados
+
+
+def predice_bosque_temprano_lote(
+    bosque: list[an.NodoN],
+    datos: list[dict[str, float | int]],
+    margen: float | None = None,
+) -> tuple[list[any], list[int]]:
+    predicciones = []
+    evaluados = []
+    for instancia in datos:
+        prediccion, n = predice_bosque_temprano(bosque, instancia, margen)
+        predicciones.append(prediccion)
+        evaluados.append(n)
+    return predicciones, evaluados
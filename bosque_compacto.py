@@ -0,0 +1,208 @@
+"""
+Almacenamiento compacto de bosques de árboles numéricos
+
+Cada NodoN es un objeto de Python con su propio diccionario, lo que ocupa cientos de bytes por nodo. Aquí todos los nodos de
+todos los árboles se guardan en arreglos compartidos (módulo array):
+
+    atributo: índice del atributo (los nombres se guardan una sola vez), -1 si el nodo es hoja
+    umbral: el valor de corte, en float32 si todos los umbrales se representan sin pérdida, si no en float64
+    clase: índice de la clase del nodo (uint8 o uint16 según el número de clases)
+    mayor: posición del hijo mayor (int32)
+
+Los nodos de cada árbol se guardan en preorden, así que el hijo menor de un nodo interno siempre es el nodo siguiente.
+
+"""
+
+import sys
+from array import array
+
+
+def _tipo_indice(n, firmado=False):
+    for tipo in ("b", "h", "i") if firmado else ("B", "H", "I"):
+        if n <= 1 << (8 * array(tipo).itemsize - firmado):
+            return tipo
+    raise ValueError(f"Demasiados valores distintos ({n}) para indexarlos")
+
+
+class BosqueCompacto:
+    def __init__(self, bosque, umbral_32=None):
+        """
+        Construye la versión compacta de un bosque
+
+        Parámetros:
+        -----------
+        bosque: list(NodoN)
+            La lista de nodos raíz de los árboles
+        umbral_32: bool
+            Si es True los umbrales se guardan en float32 aunque se pierda precisión, si es False en float64.
+            Si es None se usa float32 solo cuando todos los umbrales se representan exactamente
+        """
+        if len(bosque) == 0:
+            raise ValueError("El bosque no tiene árboles")
+
+        self.atributos = []
+        self.clases = []
+        id_atributo = {}
+        id_clase = {}
+
+        atributos, umbrales, clases, mayores, raices = [], [], [], [], []
+        for raiz in bosque:
+            raices.append(len(atributos))
+            # Recorrido en preorden: (nodo, posición del padre que espera a su hijo mayor)
+            pila = [(raiz, None)]
+            while pila:
+                nodo, padre = pila.pop()
+                indice = len(atributos)
+                if padre is not None:
+                    mayores[padre] = indice
+                if nodo.clase_default not in id_clase:
+                    id_clase[nodo.clase_default] = len(self.clases)
+                    self.clases.append(nodo.clase_default)
+                clases.append(id_clase[nodo.clase_default])
+                mayores.append(-1)
+                if nodo.terminal:
+                    atributos.append(-1)
+                    umbrales.append(0.0)
+                    continue
+                if nodo.atributo not in id_atributo:
+                    id_atributo[nodo.atributo] = len(self.atributos)
+                    self.atributos.append(nodo.atributo)
+                atributos.append(id_atributo[nodo.atributo])
+                umbrales.append(nodo.valor)
+                pila.append((nodo.hijo_mayor, indice))
+                pila.append((nodo.hijo_menor, None))
+
+        if umbral_32 is None:
+            umbral_32 = array("f", umbrales).tolist() == umbrales
+        self.atributo = array(
+            _tipo_indice(len(self.atributos), firmado=True), atributos
+        )
+        self.umbral = array("f" if umbral_32 else "d", umbrales)
+        self.clase = array(_tipo_indice(len(self.clases)), clases)
+        self.mayor = array("i", mayores)
+        self.raices = array("i", raices)
+
+    def __len__(self):
+        return len(self.raices)
+
+    def predice_arbol(self, arbol, instancia):
+        """
+        Predice la clase de una instancia con uno de los árboles del bosque
+
+        Parámetros:
+        -----------
+        arbol: int
+            El índice del árbol en el bosque
+        instancia: dict
+            La instancia a clasificar
+
+        Regresa:
+        --------
+        clase:
+            La clase predicha, igual a la que regresa NodoN.predice
+        """
+        atributo, umbral, mayor, nombres = (
+            self.atributo,
+            self.umbral,
+            self.mayor,
+            self.atributos,
+        )
+        i = self.raices[arbol]
+        while (a := atributo[i]) >= 0:
+            if instancia[nombres[a]] < umbral[i]:
+                i += 1
+            else:
+                i = mayor[i]
+        return self.clases[self.clase[i]]
+
+    def predice(self, instancia):
+        """
+        Predice la clase de una instancia por votación de todos los árboles (como predice_bosque_aleatorio)
+        """
+        predicciones = [self.predice_arbol(t, instancia) for t in range(len(self))]
+        return max(predicciones, key=predicciones.count)
+
+    def num_nodos(self):
+        return len(self.atributo)
+
+    def reporte_memoria(self):
+        """
+        Mide la memoria ocupada por el bosque compacto
+
+        Regresa:
+        --------
+        reporte: dict
+            Número de nodos, bytes totales y bytes por nodo
+        """
+        total = sum(
+            sys.getsizeof(a)
+            for a in (self.atributo, self.umbral, self.clase, self.mayor, self.raices)
+        )
+        total += sys.getsizeof(self.atributos) + sum(map(sys.getsizeof, self.atributos))
+        total += sys.getsizeof(self.clases) + sum(map(sys.getsizeof, self.clases))
+        nodos = self.num_nodos()
+        return {"nodos": nodos, "bytes": total, "bytes_por_nodo": total / max(nodos, 1)}
+
+
+def reporte_memoria_objetos(bosque):
+    """
+    Mide la memoria ocupada por un bosque de objetos NodoN (el objeto, su diccionario y su umbral)
+
+    Parámetros:
+    -----------
+    bosque: list(NodoN)
+        La lista de nodos raíz de los árboles
+
+    Regresa:
+    --------
+    reporte: dict
+        Número de nodos, bytes totales y bytes por nodo
+    """
+    nodos = 0
+    total = sys.getsizeof(bosque)
+    pila = list(bosque)
+    while pila:
+        nodo = pila.pop()
+        nodos += 1
+        total += sys.getsizeof(nodo) + sys.getsizeof(nodo.__dict__)
+        if not nodo.terminal:
+            total += sys.getsizeof(nodo.valor)
+            pila.append(nodo.hijo_menor)
+            pila.append(nodo.hijo_mayor)
+    return {"nodos": nodos, "bytes": total, "bytes_por_nodo": total / max(nodos, 1)}
+
+
+def main():
+    import random
+
+    import bosque_aleatorio as ba
+
+    random.seed(42)
+    datos = []
+    for _ in range(500):
+        instancia = {f"atributo{i}": random.gauss(0, 1) for i in range(1, 6)}
+        positiva = instancia["atributo1"] + instancia["atributo2"] > 0
+        instancia["clase"] = "positiva" if positiva else "negativa"
+        datos.append(instancia)
+
+    bosque = ba.entrena_bosque_aleatorio(datos, 20, "clase", None, 1, 0, 2)
+    compacto = BosqueCompacto(bosque)
+
+    iguales = all(
+        compacto.predice(d) == ba.predice_bosque_aleatorio(bosque, d) for d in datos
+    )
+    print(f"Predicciones idénticas: {iguales}")
+    print(f"Umbrales en {'float32' if compacto.umbral.typecode == 'f' else 'float64'}")
+    for nombre, reporte in (
+        ("NodoN", reporte_memoria_objetos(bosque)),
+        ("BosqueCompacto", compacto.reporte_memoria()),
+    ):
+        print(
+            f"{nombre}: {reporte['nodos']} nodos, {reporte['bytes']} bytes, "
+            f"{reporte['bytes_por_nodo']:.1f} bytes por nodo"
+        )
+    return None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Generador de carga para servidor_prediccion.py
+
+Abre varios clientes concurrentes que envían solicitudes POST /predice por conexiones persistentes y reporta el throughput
+y la latencia observados, así como las estadísticas del servidor (GET /estadisticas).
+
+Si no se indica un servidor, se entrena un bosque pequeño con datos sintéticos y se levanta un servidor en localhost
+dentro del mismo proceso, de forma que todo se puede probar sin nada más.
+
+Uso:
+
+    python carga_servidor.py                                 # servidor local de prueba
+    python carga_servidor.py --puerto 8000 --datos datos.json  # servidor ya corriendo
+
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import bosque_aleatorio as ba
+import servidor_prediccion as sp
+
+
+def datos_sinteticos(n, semilla=42):
+    rng = random.Random(semilla)
+    datos = []
+    for _ in range(n):
+        instancia = {f"atributo{i}": rng.gauss(0, 1) for i in range(1, 6)}
+        positiva = instancia["atributo1"] + instancia["atributo2"] > 0
+        instancia["clase"] = "positiva" if positiva else "negativa"
+        datos.append(instancia)
+    return datos
+
+
+async def solicitud(reader, writer, metodo, ruta, cuerpo=None):
+    datos = b"" if cuerpo is None else json.dumps(cuerpo).encode()
+    writer.write(
+        f"{metodo} {ruta} HTTP/1.1\r\n"
+        f"Host: localhost\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(datos)}\r\n\r\n".encode()
+        + datos
+    )
+    await writer.drain()
+    estado = int((await reader.readline()).split()[1])
+    encabezados = {}
+    while (linea := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        encabezados[nombre.strip().lower()] = valor.strip()
+    cuerpo = await reader.readexactly(int(encabezados["content-length"]))
+    respuesta = json.loads(cuerpo)
+    if estado != 200:
+        raise RuntimeError(f"El servidor respondió {estado}: {respuesta}")
+    return respuesta
+
+
+async def conecta(host, puerto, unix):
+    if unix is not None:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, puerto)
+
+
+async def cliente(
+    host, puerto, unix, instancias, solicitudes, por_solicitud, latencias
+):
+    reader, writer = await conecta(host, puerto, unix)
+    try:
+        for _ in range(solicitudes):
+            cuerpo = {"instancias": random.sample(instancias, por_solicitud)}
+            inicio = time.perf_counter()
+            await solicitud(reader, writer, "POST", "/predice", cuerpo)
+            latencias.append(1000 * (time.perf_counter() - inicio))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def genera_carga(
+    host, puerto, unix, instancias, clientes, solicitudes, por_solicitud
+):
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(
+            cliente(
+                host, puerto, unix, instancias, solicitudes, por_solicitud, latencias
+            )
+            for _ in range(clientes)
+        )
+    )
+    transcurrido = time.perf_counter() - inicio
+
+    total = clientes * solicitudes
+    cuantiles = statistics.quantiles(latencias, n=100)
+    print(
+        f"{total} solicitudes ({total * por_solicitud} instancias) "
+        f"en {transcurrido:.2f} s"
+    )
+    print(f"Solicitudes por segundo: {total / transcurrido:.1f}")
+    print(f"Instancias por segundo: {total * por_solicitud / transcurrido:.1f}")
+    print(
+        f"Latencia (ms): media {statistics.mean(latencias):.2f}, "
+        f"p50 {cuantiles[49]:.2f}, p95 {cuantiles[94]:.2f}, p99 {cuantiles[98]:.2f}"
+    )
+
+    reader, writer = await conecta(host, puerto, unix)
+    try:
+        estadisticas = await solicitud(reader, writer, "GET", "/estadisticas")
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    print("\nEstadísticas del servidor:")
+    print(json.dumps(estadisticas, indent=2, ensure_ascii=False))
+    return None
+
+
+async def principal(args):
+    if args.puerto is None and args.unix is None:
+        datos = datos_sinteticos(1000)
+        bosque = ba.entrena_bosque_aleatorio(datos, 25, "clase", 8, 1, 0, 2)
+        instancias = [
+            {k: v for k, v in d.items() if k != "clase"}
+            for d in datos_sinteticos(200, 7)
+        ]
+        servidor = sp.ServidorPrediccion(bosque, args.max_lote, args.max_espera)
+        conexion = await servidor.inicia(args.host, 0)
+        puerto = conexion.sockets[0].getsockname()[1]
+        print(f"Servidor de prueba en http://{args.host}:{puerto}\n")
+        try:
+            async with conexion:
+                await genera_carga(
+                    args.host,
+                    puerto,
+                    None,
+                    instancias,
+                    args.clientes,
+                    args.solicitudes,
+                    args.por_solicitud,
+                )
+        finally:
+            await servidor.cierra()
+        return None
+
+    with open(args.datos) as f:
+        instancias = json.load(f)
+    await genera_carga(
+        args.host,
+        args.puerto,
+        args.unix,
+        instancias,
+        args.clientes,
+        args.solicitudes,
+        args.por_solicitud,
+    )
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=None)
+    parser.add_argument("--unix", default=None, help="Ruta de un socket Unix")
+    parser.add_argument(
+        "--datos", help="Archivo JSON con una lista de instancias (servidor externo)"
+    )
+    parser.add_argument("--clientes", type=int, default=32)
+    parser.add_argument("--solicitudes", type=int, default=50)
+    parser.add_argument("--por-solicitud", type=int, default=1)
+    parser.add_argument("--max-lote", type=int, default=256)
+    parser.add_argument("--max-espera", type=float, default=0.005)
+    args = parser.parse_args()
+    if (args.puerto is not None or args.unix is not None) and args.datos is None:
+        parser.error("--datos es necesario cuando se usa un servidor externo")
+    asyncio.run(principal(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Núcleo para calcular la entropía a partir de conteos enteros de clases
+
+La entropía de un conjunto con conteos c_1, ..., c_k y total T = sum(c_i) se puede escribir como
+
+    H = (T * log2(T) - sum(c_i * log2(c_i))) / T
+
+por lo que basta tener una tabla con los valores n * log2(n) para calcularla usando solo búsquedas en la tabla.
+La tabla crece conforme se necesita, pero nunca pasa de MAX_TABLA entradas; para conteos mayores el valor se calcula directamente.
+
+"""
+
+import math
+import threading
+from array import array
+
+MAX_TABLA = 1 << 20
+
+_tabla = array("d", [0.0, 0.0])
+_candado = threading.Lock()
+
+
+def _crece_tabla(n):
+    """
+    Extiende la tabla de n * log2(n) hasta incluir n (acotado por MAX_TABLA)
+
+    La tabla nueva se construye aparte y luego se reemplaza, de forma que los
+    hilos que la están leyendo nunca ven entradas a medio calcular.
+
+    Parámetros:
+    -----------
+    n: int
+        El conteo más grande que se quiere tener en la tabla
+    """
+    global _tabla
+    with _candado:
+        inicio = len(_tabla)
+        if n < inicio:
+            return
+        fin = min(max(n + 1, 2 * inicio), MAX_TABLA)
+        nueva = array("d", _tabla)
+        nueva.extend(i * math.log2(i) for i in range(inicio, fin))
+        _tabla = nueva
+
+
+def n_log2_n(n):
+    """
+    Regresa n * log2(n) para un entero n >= 0 (con 0 * log2(0) = 0)
+
+    Parámetros:
+    -----------
+    n: int
+        Un conteo entero no negativo
+
+    Regresa:
+    --------
+    valor: float
+        El valor de n * log2(n)
+    """
+    tabla = _tabla
+    if n < len(tabla):
+        return tabla[n]
+    if n < MAX_TABLA:
+        _crece_tabla(n)
+        return _tabla[n]
+    return n * math.log2(n)
+
+
+def entropia_conteos(conteos):
+    """
+    Calcula la entropía a partir de un vector de conteos enteros de clases
+
+    Parámetros:
+    -----------
+    conteos: iterable(int)
+        El número de ejemplos de cada clase
+
+    Regresa:
+    --------
+    entropia: float
+        La entropía de la distribución de clases
+    """
+    total = 0
+    suma = 0.0
+    for c in conteos:
+        total += c
+        suma += n_log2_n(c)
+    if total == 0:
+        return 0.0
+    return max((n_log2_n(total) - suma) / total, 0.0)
@@ -8,7 +8,7 @@ import math
 
 url = "https://archive.ics.uci.edu/static/public/17/breast+cancer+wisconsin+diagnostic.zip"
 archivo = "datos/cancer.zip"
-archivo_datos = "datos/wdbc.data"
+miembro = "wdbc.data"
 atributos = ["ID", "Diagnosis"] + [f"feature_{i}" for i in range(1, 31)]
 
 # Descarga datos
@@ -16,14 +16,17 @@ atributos = ["ID", "Diagnosis"] + [f"feature_{i}" for i in range(1, 31)]
 #     os.makedirs("datos")
 # if not os.path.exists(archivo):
 #     ut.descarga_datos(url, archivo)
-#     ut.descomprime_zip(archivo)
 
-# Extrae datos y convierte a numericos
-datos = ut.lee_csv(archivo_datos, atributos=atributos, separador=",")
+# Lee los datos directamente del zip, ya convertidos a numericos (con cache en disco)
+datos = ut.carga_datos(
+    archivo,
+    miembro=miembro,
+    atributos=atributos,
+    separador=",",
+    tipos={f"feature_{i}": float for i in range(1, 31)},
+)
 for d in datos:
     d["Diagnosis"] = 1 if d["Diagnosis"] == "M" else 0
-    for i in range(1, 31):
-        d[f"feature_{i}"] = float(d[f"feature_{i}"])
     del d["ID"]
 
 # Selecciona los artributos
@@ -7,13 +7,13 @@ import random
 
 url = "https://archive.ics.uci.edu/static/public/19/car+evaluation.zip"
 archivo = "datos/car.zip"
-archivo_datos = "datos/car.data"
+miembro = "car.data"
 atributos = ["buying", "maint", "doors", "persons", "lug_boot", "safety", "class"]
 target = "class"
 
 # url = 'https://archive.ics.uci.edu/static/public/73/mushroom.zip'
 # archivo = 'datos/mushroom.zip'
-# archivo_datos = 'datos/agaricus-lepiota.data'
+# miembro = 'agaricus-lepiota.data'
 # atributos = ['class', 'cap-shape', 'cap-surface', 'cap-color', 'bruises', 'odor', 'gill-attachment', 'gill-spacing', 'gill-size', 'gill-color', 'stalk-shape', 'stalk-root', 'stalk-surface-above-ring', 'stalk-surface-below-ring', 'stalk-color-above-ring', 'stalk-color-below-ring', 'veil-type', 'veil-color', 'ring-number', 'ring-type', 'spore-print-color', 'population', 'habitat']
 # target = 'class'
 
@@ -21,10 +21,9 @@ target = "class"
 #     os.makedirs("datos")
 # if not os.path.exists(archivo):
 #     ut.descarga_datos(url, archivo)
-#     ut.descomprime_zip(archivo)
 
-# Lee los datos
-datos = ut.lee_csv(archivo_datos, atributos=atributos, separador=",")
+# Lee los datos directamente del zip (con cache en disco)
+datos = ut.carga_datos(archivo, miembro=miembro, atributos=atributos, separador=",")
 
 
 # Selecciona un conjunto de entrenamiento y de validación
@@ -0,0 +1,295 @@
+"""
+Servidor local de predicción para bosques aleatorios con agrupación de solicitudes en micro-lotes
+
+El modelo (una lista de nodos raíz guardada con pickle) se carga una sola vez. Las solicitudes que llegan al mismo tiempo
+se juntan en un lote que se predice de una vez, esperando a lo más max_espera segundos desde que llegó la primera
+(o hasta juntar max_lote instancias).
+
+Protocolo (HTTP/1.1, por TCP o por un socket Unix):
+
+    POST /predice        con cuerpo JSON {"instancias": [{...}, ...]}  regresa {"predicciones": [...]}
+    GET  /estadisticas   regresa el throughput y los histogramas de latencia y de tamaño de lote
+
+Las estadísticas de predicciones y latencia cuentan instancias, pero solo las de solicitudes respondidas con éxito;
+el histograma de tamaño de lote cuenta todas las instancias que se predijeron en cada lote.
+
+Uso:
+
+    python servidor_prediccion.py modelo.pkl --puerto 8000
+    python servidor_prediccion.py modelo.pkl --unix /tmp/bosque.sock
+
+"""
+
+import argparse
+import asyncio
+import json
+import pickle
+import time
+from bisect import bisect_left
+
+import bosque_aleatorio as ba
+
+LIMITES_LATENCIA_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+LIMITES_LOTE = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+MENSAJES = {200: "OK", 400: "Bad Request", 404: "Not Found"}
+
+
+def carga_modelo(archivo):
+    with open(archivo, "rb") as f:
+        return pickle.load(f)
+
+
+def guarda_modelo(bosque, archivo):
+    with open(archivo, "wb") as f:
+        pickle.dump(bosque, f)
+    return None
+
+
+def atributos_bosque(bosque):
+    """
+    Regresa el conjunto de atributos que usan los nodos internos de los árboles
+    """
+    atributos = set()
+    pila = list(bosque)
+    while pila:
+        nodo = pila.pop()
+        if not nodo.terminal:
+            atributos.add(nodo.atributo)
+            pila.append(nodo.hijo_menor)
+            pila.append(nodo.hijo_mayor)
+    return atributos
+
+
+class Histograma:
+    def __init__(self, limites):
+        self.limites = limites
+        self.conteos = [0] * (len(limites) + 1)
+        self.total = 0
+        self.suma = 0.0
+
+    def agrega(self, valor):
+        self.conteos[bisect_left(self.limites, valor)] += 1
+        self.total += 1
+        self.suma += valor
+
+    def como_dict(self):
+        etiquetas = [f"<={l}" for l in self.limites] + [f">{self.limites[-1]}"]
+        return {
+            "total": self.total,
+            "media": self.suma / self.total if self.total else 0.0,
+            "conteos": dict(zip(etiquetas, self.conteos)),
+        }
+
+
+class ServidorPrediccion:
+    def __init__(self, bosque, max_lote=256, max_espera=0.005):
+        """
+        Parámetros:
+        -----------
+        bosque: list(NodoN)
+            El modelo, una lista de nodos raíz
+        max_lote: int
+            El número máximo de instancias en un micro-lote
+        max_espera: float
+            El tiempo máximo (en segundos) que espera la primera instancia de un lote a que lleguen más
+        """
+        self.bosque = bosque
+        self.atributos = atributos_bosque(bosque)
+        self.max_lote = max_lote
+        self.max_espera = max_espera
+        self.cola = None
+        self.inicio = time.perf_counter()
+        self.predicciones = 0
+        self.latencias = Histograma(LIMITES_LATENCIA_MS)
+        self.lotes = Histograma(LIMITES_LOTE)
+
+    def predice_lote(self, instancias):
+        """
+        Predice un lote y regresa, por cada instancia, un par (predicción, error). Si el lote
+        completo falla, las instancias se predicen una por una para que solo fallen las inválidas
+        """
+        try:
+            predicciones, _ = ba.predice_bosque_temprano_lote(self.bosque, instancias)
+            return [(prediccion, None) for prediccion in predicciones]
+        except Exception:
+            resultados = []
+            for instancia in instancias:
+                try:
+                    resultados.append(
+                        (ba.predice_bosque_temprano(self.bosque, instancia)[0], None)
+                    )
+                except Exception as error:
+                    resultados.append((None, error))
+            return resultados
+
+    async def predice(self, instancias):
+        """
+        Encola las instancias y espera a que el micro-lote donde quedaron sea predicho
+        """
+        for instancia in instancias:
+            if not isinstance(instancia, dict):
+                raise TypeError(f"La instancia no es un objeto: {instancia!r}")
+            faltantes = self.atributos - instancia.keys()
+            if faltantes:
+                raise KeyError(f"Faltan los atributos {sorted(faltantes)}")
+
+        loop = asyncio.get_running_loop()
+        llegada = time.perf_counter()
+        futuros = []
+        for instancia in instancias:
+            futuro = loop.create_future()
+            self.cola.put_nowait((instancia, futuro))
+            futuros.append(futuro)
+        resultados = await asyncio.gather(*futuros, return_exceptions=True)
+        for resultado in resultados:
+            if isinstance(resultado, Exception):
+                raise resultado
+
+        # Solo se cuentan las solicitudes que se responden con éxito
+        for _, fin in resultados:
+            self.latencias.agrega(1000 * (fin - llegada))
+        self.predicciones += len(resultados)
+        return [prediccion for prediccion, _ in resultados]
+
+    async def agrupa(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self.cola.get()]
+            limite = loop.time() + self.max_espera
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self.cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            instancias = [instancia for instancia, _ in lote]
+            resultados = await loop.run_in_executor(None, self.predice_lote, instancias)
+
+            fin = time.perf_counter()
+            self.lotes.agrega(len(lote))
+            for (_, futuro), (prediccion, error) in zip(lote, resultados):
+                if futuro.done():
+                    continue
+                if error is not None:
+                    futuro.set_exception(error)
+                else:
+                    futuro.set_result((prediccion, fin))
+
+    def estadisticas(self):
+        transcurrido = time.perf_counter() - self.inicio
+        return {
+            "predicciones": self.predicciones,
+            "segundos": transcurrido,
+            "predicciones_por_segundo": self.predicciones / transcurrido,
+            "latencia_ms": self.latencias.como_dict(),
+            "tamano_lote": self.lotes.como_dict(),
+        }
+
+    async def atiende(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                encabezados = {}
+                while (linea := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                cuerpo = await reader.readexactly(
+                    int(encabezados.get("content-length", 0))
+                )
+
+                estado, respuesta = await self.responde(metodo, ruta, cuerpo)
+                datos = json.dumps(respuesta).encode()
+                writer.write(
+                    f"HTTP/1.1 {estado} {MENSAJES[estado]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(datos)}\r\n\r\n".encode()
+                    + datos
+                )
+                await writer.drain()
+                if encabezados.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # El servidor se está cerrando con la conexión abierta
+            pass
+        finally:
+            writer.close()
+
+    async def responde(self, metodo, ruta, cuerpo):
+        if metodo == "GET" and ruta == "/estadisticas":
+            return 200, self.estadisticas()
+        if metodo == "POST" and ruta == "/predice":
+            try:
+                instancias = json.loads(cuerpo)["instancias"]
+            except (ValueError, KeyError, TypeError):
+                return 400, {"error": 'Se esperaba {"instancias": [...]}'}
+            try:
+                return 200, {"predicciones": await self.predice(instancias)}
+            except (KeyError, TypeError, ValueError) as error:
+                return 400, {"error": f"Instancia inválida: {error!r}"}
+        return 404, {"error": f"No existe {metodo} {ruta}"}
+
+    async def inicia(self, host="127.0.0.1", puerto=8000, unix=None):
+        """
+        Arranca el agrupador de lotes y regresa el asyncio.Server que atiende las conexiones
+        """
+        self.cola = asyncio.Queue()
+        self.inicio = time.perf_counter()
+        self._agrupador = asyncio.create_task(self.agrupa())
+        if unix is not None:
+            return await asyncio.start_unix_server(self.atiende, path=unix)
+        return await asyncio.start_server(self.atiende, host, puerto)
+
+    async def cierra(self):
+        """
+        Detiene el agrupador de lotes. Se llama después de cerrar el asyncio.Server
+        """
+        self._agrupador.cancel()
+        try:
+            await self._agrupador
+        except asyncio.CancelledError:
+            pass
+
+
+async def sirve(archivo_modelo, host, puerto, unix, max_lote, max_espera):
+    servidor = ServidorPrediccion(carga_modelo(archivo_modelo), max_lote, max_espera)
+    conexion = await servidor.inicia(host, puerto, unix)
+    print(f"Sirviendo en {unix or f'http://{host}:{puerto}'}")
+    try:
+        async with conexion:
+            await conexion.serve_forever()
+    finally:
+        await servidor.cierra()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modelo", help="Archivo pickle con la lista de árboles")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--unix", default=None, help="Ruta de un socket Unix")
+    parser.add_argument("--max-lote", type=int, default=256)
+    parser.add_argument("--max-espera", type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(
+        sirve(
+            args.modelo,
+            args.host,
+            args.puerto,
+            args.unix,
+            args.max_lote,
+            args.max_espera,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
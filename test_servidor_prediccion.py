@@ -0,0 +1,79 @@
+import asyncio
+import json
+import random
+
+import bosque_aleatorio as ba
+import servidor_prediccion as sp
+
+
+def bosque_y_datos():
+    rng = random.Random(0)
+    datos = []
+    for _ in range(200):
+        instancia = {"atributo1": rng.random(), "atributo2": rng.random()}
+        positiva = instancia["atributo1"] + instancia["atributo2"] > 1
+        instancia["clase"] = "positiva" if positiva else "negativa"
+        datos.append(instancia)
+    random.seed(0)
+    bosque = ba.entrena_bosque_aleatorio(datos, 7, "clase", 4, 1, 0, 1)
+    instancias = [{k: v for k, v in d.items() if k != "clase"} for d in datos[:30]]
+    return bosque, instancias
+
+
+async def post(puerto, cuerpo):
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+    datos = json.dumps(cuerpo).encode()
+    writer.write(
+        f"POST /predice HTTP/1.1\r\nContent-Length: {len(datos)}\r\n"
+        "Connection: close\r\n\r\n".encode()
+        + datos
+    )
+    await writer.drain()
+    respuesta = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    encabezado, _, cuerpo = respuesta.partition(b"\r\n\r\n")
+    return int(encabezado.split()[1]), json.loads(cuerpo)
+
+
+def sirve_y_envia(bosque, cuerpos):
+    async def principal():
+        servidor = sp.ServidorPrediccion(bosque, max_espera=0.01)
+        conexion = await servidor.inicia("127.0.0.1", 0)
+        puerto = conexion.sockets[0].getsockname()[1]
+        try:
+            async with conexion:
+                respuestas = await asyncio.gather(*(post(puerto, c) for c in cuerpos))
+        finally:
+            await servidor.cierra()
+        return respuestas, servidor
+
+    return asyncio.run(principal())
+
+
+def test_predice_igual_que_el_bosque():
+    bosque, instancias = bosque_y_datos()
+    respuestas, servidor = sirve_y_envia(bosque, [{"instancias": instancias}])
+    [(estado, respuesta)] = respuestas
+    assert estado == 200
+    assert respuesta["predicciones"] == [
+        ba.predice_bosque_aleatorio(bosque, d) for d in instancias
+    ]
+    assert servidor.predicciones == len(instancias)
+
+
+def test_instancias_invalidas():
+    bosque, instancias = bosque_y_datos()
+    cuerpos = [
+        {"instancias": [instancias[0], 3]},
+        {"instancias": [{"atributo1": 0.5}]},
+        {"instancias": [instancias[0], {"atributo1": "x", "atributo2": "y"}]},
+        {"instancias": instancias[:2]},
+    ]
+    respuestas, servidor = sirve_y_envia(bosque, cuerpos)
+    assert [estado for estado, _ in respuestas] == [400, 400, 400, 200]
+    assert "no es un objeto" in respuestas[0][1]["error"]
+    assert "Faltan los atributos" in respuestas[1][1]["error"]
+    assert "TypeError" in respuestas[2][1]["error"]
+    # Solo cuentan las instancias de la solicitud respondida con éxito
+    assert servidor.predicciones == 2
@@ -0,0 +1,56 @@
+import zipfile
+
+import pytest
+
+import utileria as ut
+
+
+def escribe_zip(ruta, miembro, texto):
+    with zipfile.ZipFile(ruta, "w") as z:
+        z.writestr(miembro, texto)
+    return str(ruta)
+
+
+def test_lee_columnas_desde_zip(tmp_path):
+    archivo = escribe_zip(tmp_path / "d.zip", "d.csv", "a,b,c\n1,2,x\n3,4,y\n")
+    columnas = ut.lee_columnas(archivo, "d.csv", tipos={"a": int, "b": float})
+    assert list(columnas["a"]) == [1, 3]
+    assert list(columnas["b"]) == [2.0, 4.0]
+    assert columnas["c"] == ["x", "y"]
+
+
+def test_lee_columnas_fila_incompleta(tmp_path):
+    archivo = escribe_zip(tmp_path / "d.zip", "d.csv", "a,b,c\n1,2,x\n3,y\n5,6,z\n")
+    with pytest.raises(ValueError, match="linea 3"):
+        ut.lee_columnas(archivo, "d.csv")
+
+
+def test_carga_datos_fila_incompleta_no_llena_cache(tmp_path):
+    archivo = escribe_zip(tmp_path / "d.zip", "d.csv", "1,2\n3\n")
+    cache = tmp_path / "cache"
+    with pytest.raises(ValueError, match="linea 2"):
+        ut.carga_datos(archivo, "d.csv", atributos=["a", "b"], cache=str(cache))
+    assert not cache.exists() or not any(cache.iterdir())
+
+
+def test_carga_datos_usa_cache(tmp_path):
+    archivo = escribe_zip(tmp_path / "d.zip", "d.csv", "a,b\n1,x\n2,y\n")
+    cache = str(tmp_path / "cache")
+    primera = ut.carga_datos(archivo, "d.csv", tipos={"a": float}, cache=cache)
+    segunda = ut.carga_datos(archivo, "d.csv", tipos={"a": float}, cache=cache)
+    assert primera == segunda == [{"a": 1.0, "b": "x"}, {"a": 2.0, "b": "y"}]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_carga_datos_convertidores_propios_no_usan_cache(tmp_path):
+    archivo = escribe_zip(tmp_path / "d.zip", "d.csv", "c\nab\n")
+    cache = tmp_path / "cache"
+    mayusculas = ut.carga_datos(
+        archivo, "d.csv", tipos={"c": lambda v: v.upper()}, cache=str(cache)
+    )
+    doble = ut.carga_datos(
+        archivo, "d.csv", tipos={"c": lambda v: v * 2}, cache=str(cache)
+    )
+    assert mayusculas == [{"c": "AB"}]
+    assert doble == [{"c": "abab"}]
+    assert not cache.exists()
@@ -4,9 +4,19 @@ Este archivo contiene funciones que se utilizan en el miniproyecto.
 Como leer archivos de datos y formatearlos para que sean utilizados en los algoritmos.
 """
 
-from urllib3 import request
 import urllib.request
 import zipfile
+import gzip
+import hashlib
+import io
+import os
+import pickle
+from array import array
+from contextlib import contextmanager
+
+# Cambiar VERSION_CACHE cuando cambie lee_columnas o el formato guardado, para invalidar el cache
+VERSION_CACHE = 1
+TIPOS_CACHE = (float, int, str)
 
 def descarga_datos(url, archivo):
     """
@@ -61,3 +71,156 @@ def lee_csv(archivo, atributos=None, separador=','):
     for l in lineas[1:]:
         datos.append({c: v for c, v in zip(columnas, l.strip().split(','))})
     return datos
+
+@contextmanager
+def abre_miembro(archivo, miembro=None):
+    """
+    Abre un archivo de texto para lectura en flujo, sin descomprimirlo a disco.
+    Funciona con archivos zip (leyendo uno de sus miembros), gzip o sin comprimir.
+
+    Parámetros
+    ----------
+    archivo : str
+        Nombre del archivo (zip, gzip o de texto).
+    miembro : str
+        Nombre del archivo dentro del zip. Si es None y el zip tiene un solo archivo, se usa ese.
+    """
+    if zipfile.is_zipfile(archivo):
+        with zipfile.ZipFile(archivo, 'r') as zip_ref:
+            if miembro is None:
+                nombres = [n for n in zip_ref.namelist() if not n.endswith('/')]
+                if len(nombres) != 1:
+                    raise ValueError(f"Hay que indicar el miembro del zip, opciones: {nombres}")
+                miembro = nombres[0]
+            with zip_ref.open(miembro) as f:
+                yield io.TextIOWrapper(f, encoding='utf-8')
+    else:
+        with open(archivo, 'rb') as f:
+            comprimido = f.read(2) == b'\x1f\x8b'
+        abre = gzip.open if comprimido else open
+        with abre(archivo, 'rt', encoding='utf-8') as f:
+            yield f
+
+def lee_columnas(archivo, miembro=None, atributos=None, separador=',', tipos=None):
+    """
+    Lee un CSV (dentro de un zip, gzip o sin comprimir) en forma de columnas, convirtiendo cada
+    valor conforme se lee. Las columnas de tipo float o int se guardan en arreglos compactos.
+
+    Parámetros
+    ----------
+    archivo : str
+        Nombre del archivo.
+    miembro : str
+        Nombre del archivo dentro del zip.
+    atributos : list(str)
+        Nombres de las columnas. Si es None, se toman de la primera linea del archivo.
+    separador : str
+        Separador de columnas.
+    tipos : dict(str, callable)
+        Función de conversión de cada columna (float, int, str u otra). Las columnas que no
+        aparecen se dejan como str.
+
+    Regresa
+    -------
+    columnas : dict(str, list)
+        Para cada atributo, la lista (o array) con sus valores.
+    """
+    tipos = tipos or {}
+    with abre_miembro(archivo, miembro) as f:
+        num_linea = 0
+        if atributos is None:
+            atributos = f.readline().strip().split(separador)
+            num_linea = 1
+        convierte = [tipos.get(a, str) for a in atributos]
+        valores = [[] for _ in atributos]
+        for linea in f:
+            num_linea += 1
+            linea = linea.strip()
+            if not linea:
+                continue
+            campos = linea.split(separador)
+            if len(campos) != len(atributos):
+                raise ValueError(
+                    f"La linea {num_linea} tiene {len(campos)} columnas, se esperaban {len(atributos)}")
+            for columna, conv, v in zip(valores, convierte, campos):
+                columna.append(conv(v))
+    columnas = {}
+    for a, conv, columna in zip(atributos, convierte, valores):
+        if conv is float:
+            columna = array('d', columna)
+        elif conv is int:
+            columna = array('q', columna)
+        columnas[a] = columna
+    return columnas
+
+def columnas_a_registros(columnas):
+    """
+    Convierte datos por columnas a una lista de diccionarios (el formato de los árboles).
+
+    Parámetros
+    ----------
+    columnas : dict(str, list)
+        Para cada atributo, la lista de sus valores.
+    """
+    nombres = list(columnas)
+    return [dict(zip(nombres, fila)) for fila in zip(*columnas.values())]
+
+def huella_archivo(archivo, bloque=1 << 20):
+    """
+    Calcula el hash SHA-256 del contenido de un archivo.
+
+    Parámetros
+    ----------
+    archivo : str
+        Nombre del archivo.
+    bloque : int
+        Tamaño de los bloques que se leen.
+    """
+    h = hashlib.sha256()
+    with open(archivo, 'rb') as f:
+        while datos := f.read(bloque):
+            h.update(datos)
+    return h.hexdigest()
+
+def carga_datos(archivo, miembro=None, atributos=None, separador=',', tipos=None,
+                cache='datos/cache'):
+    """
+    Lee un CSV con lee_columnas y regresa una lista de diccionarios, guardando las columnas ya
+    convertidas en un cache en disco. La llave del cache es el hash del contenido del archivo
+    junto con los parámetros de lectura, así que en corridas posteriores no se vuelve a leer el CSV.
+
+    Parámetros
+    ----------
+    archivo : str
+        Nombre del archivo (zip, gzip o de texto).
+    miembro : str
+        Nombre del archivo dentro del zip.
+    atributos : list(str)
+        Nombres de las columnas. Si es None, se toman de la primera linea del archivo.
+    separador : str
+        Separador de columnas.
+    tipos : dict(str, callable)
+        Función de conversión de cada columna. El cache solo se usa si todas son float, int o str,
+        porque otras funciones no se pueden identificar de forma confiable en la llave.
+    cache : str
+        Directorio del cache. Si es None no se usa cache.
+    """
+    if cache is None or any(t not in TIPOS_CACHE for t in (tipos or {}).values()):
+        return columnas_a_registros(lee_columnas(archivo, miembro, atributos, separador, tipos))
+
+    llave = hashlib.sha256(repr((
+        VERSION_CACHE, huella_archivo(archivo), miembro, atributos, separador,
+        sorted((a, t.__name__) for a, t in (tipos or {}).items())
+    )).encode()).hexdigest()
+    archivo_cache = os.path.join(cache, llave + '.pkl')
+    if os.path.exists(archivo_cache):
+        with open(archivo_cache, 'rb') as f:
+            return columnas_a_registros(pickle.load(f))
+
+    columnas = lee_columnas(archivo, miembro, atributos, separador, tipos)
+    os.makedirs(cache, exist_ok=True)
+    temporal = archivo_cache + '.tmp'
+    with open(temporal, 'wb') as f:
+        pickle.dump(columnas, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, archivo_cache)
+    return columnas_a_registros(columnas)
@@ -0,0 +1,264 @@
+"""
+Validación cruzada con k particiones y búsqueda en malla de hiperparámetros para árboles numéricos y bosques aleatorios
+
+Cada combinación (partición, configuración) se evalúa en un pool de procesos. Los datos se envían una sola vez a cada proceso
+al iniciarlo (no con cada tarea). Las configuraciones se mandan en bloques que pertenecen a una sola partición, y cada proceso
+guarda únicamente los conjuntos de entrenamiento y validación de la última partición que usó, de forma que las configuraciones
+de un mismo bloque no los vuelven a construir y cada proceso tiene a lo más una copia de las listas de la partición.
+
+Los hiperparámetros que se pueden incluir en la malla son max_profundidad, acc_nodo, min_ejemplos,
+variables_seleccionadas y M (número de árboles del bosque; si es None se entrena un solo árbol).
+
+"""
+
+import functools
+import itertools
+import math
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import arboles_numericos as an
+import bosque_aleatorio as ba
+
+PARAMETROS_DEFAULT = {
+    "max_profundidad": None,
+    "acc_nodo": 1.0,
+    "min_ejemplos": 0,
+    "variables_seleccionadas": None,
+    "M": None,
+}
+
+# Estado de cada proceso trabajador, se llena en _inicializa_proceso
+_datos = None
+_target = None
+_pliegues = None
+_particion_actual = (None, None, None)
+
+
+def particiona_kfold(n, k, semilla=None):
+    """
+    Reparte los índices 0, ..., n-1 en k particiones de tamaño similar
+
+    Parámetros:
+    -----------
+    n: int
+        El número de instancias
+    k: int
+        El número de particiones
+    semilla: int
+        La semilla para revolver los índices. Si es None no se fija
+
+    Regresa:
+    --------
+    pliegues: list(list(int))
+        Los índices de validación de cada partición
+    """
+    if not 2 <= k <= n:
+        raise ValueError(f"k debe estar entre 2 y {n}, se recibió {k}")
+    indices = list(range(n))
+    random.Random(semilla).shuffle(indices)
+    return [indices[i::k] for i in range(k)]
+
+
+def malla_parametros(rejilla):
+    """
+    Genera todas las configuraciones de una malla de hiperparámetros
+
+    Parámetros:
+    -----------
+    rejilla: dict(str, list)
+        Para cada hiperparámetro, la lista de valores a probar. Los que no aparecen toman su valor en PARAMETROS_DEFAULT
+
+    Regresa:
+    --------
+    configuraciones: list(dict)
+        Una configuración completa por cada combinación de valores
+    """
+    desconocidos = set(rejilla) - set(PARAMETROS_DEFAULT)
+    if desconocidos:
+        raise ValueError(f"Hiperparámetros desconocidos: {sorted(desconocidos)}")
+    nombres = list(rejilla)
+    return [
+        {**PARAMETROS_DEFAULT, **dict(zip(nombres, valores))}
+        for valores in itertools.product(*(rejilla[n] for n in nombres))
+    ]
+
+
+def _inicializa_proceso(datos, target, pliegues):
+    global _datos, _target, _pliegues, _particion_actual
+    _datos = datos
+    _target = target
+    _pliegues = pliegues
+    _particion_actual = (None, None, None)
+
+
+def _particion(pliegue):
+    # Solo se guarda la última partición, para no tener k copias por proceso
+    global _particion_actual
+    if _particion_actual[0] != pliegue:
+        validacion = set(_pliegues[pliegue])
+        _particion_actual = (
+            pliegue,
+            [d for i, d in enumerate(_datos) if i not in validacion],
+            [_datos[i] for i in _pliegues[pliegue]],
+        )
+    return _particion_actual[1], _particion_actual[2]
+
+
+def _evalua_bloque(bloque):
+    pliegue, configuraciones, semilla = bloque
+    return [
+        _evalua(indice, pliegue, config, semilla) for indice, config in configuraciones
+    ]
+
+
+def _evalua(indice, pliegue, config, semilla):
+    entrenamiento, validacion = _particion(pliegue)
+    if semilla is not None:
+        random.seed(f"{semilla}-{indice}-{pliegue}")
+    clase_default = Counter(d[_target] for d in entrenamiento).most_common(1)[0][0]
+
+    inicio = time.perf_counter()
+    if config["M"] is None:
+        modelo = an.entrena_arbol(
+            entrenamiento,
+            _target,
+            clase_default,
+            config["max_profundidad"],
+            config["acc_nodo"],
+            config["min_ejemplos"],
+            config["variables_seleccionadas"],
+        )
+        predice = modelo.predice
+    else:
+        modelo = ba.entrena_bosque_aleatorio(
+            entrenamiento,
+            config["M"],
+            _target,
+            config["max_profundidad"],
+            config["acc_nodo"],
+            config["min_ejemplos"],
+            config["variables_seleccionadas"],
+        )
+        predice = functools.partial(ba.predice_bosque_aleatorio, modelo)
+    t_entrena = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    aciertos = sum(1 for d in validacion if predice(d) == d[_target])
+    t_predice = time.perf_counter() - inicio
+    return indice, aciertos / len(validacion), t_entrena, t_predice
+
+
+def valida_cruzado(datos, target, rejilla, k=5, procesos=None, semilla=None):
+    """
+    Evalúa con validación cruzada de k particiones todas las configuraciones de una malla
+
+    Parámetros:
+    -----------
+    datos: list(dict)
+        Una lista de diccionarios donde cada diccionario representa una instancia.
+    target: str
+        El nombre del atributo que se quiere predecir
+    rejilla: dict(str, list)
+        Los valores a probar de cada hiperparámetro (ver malla_parametros)
+    k: int
+        El número de particiones
+    procesos: int
+        El número de procesos del pool. Si es None se usa el número de CPUs, si es 1 todo se evalúa en el proceso actual
+    semilla: int
+        La semilla para las particiones y el entrenamiento. Si es None no se fija
+
+    Regresa:
+    --------
+    resultados: list(dict)
+        Por cada configuración, sus hiperparámetros más acc_media, acc_std, t_entrena y t_predice (medias en segundos por partición)
+    """
+    configuraciones = malla_parametros(rejilla)
+    pliegues = particiona_kfold(len(datos), k, semilla)
+
+    # Bloques de configuraciones de una sola partición, suficientes para
+    # ocupar todos los procesos aunque haya menos particiones que procesos
+    bloques_por_pliegue = math.ceil((procesos or os.cpu_count() or 1) / k)
+    tamano = math.ceil(len(configuraciones) / bloques_por_pliegue)
+    indexadas = list(enumerate(configuraciones))
+    bloques = [
+        (p, indexadas[inicio : inicio + tamano], semilla)
+        for p in range(k)
+        for inicio in range(0, len(indexadas), tamano)
+    ]
+
+    if procesos == 1:
+        _inicializa_proceso(datos, target, pliegues)
+        salidas = [s for b in bloques for s in _evalua_bloque(b)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializa_proceso,
+            initargs=(datos, target, pliegues),
+        ) as ejecutor:
+            salidas = [s for r in ejecutor.map(_evalua_bloque, bloques) for s in r]
+
+    por_config = [[] for _ in configuraciones]
+    for indice, acc, t_entrena, t_predice in salidas:
+        por_config[indice].append((acc, t_entrena, t_predice))
+
+    resultados = []
+    for config, mediciones in zip(configuraciones, por_config):
+        accs, t_entrenas, t_predices = zip(*mediciones)
+        resultados.append(
+            {
+                **config,
+                "acc_media": statistics.mean(accs),
+                "acc_std": statistics.pstdev(accs),
+                "t_entrena": statistics.mean(t_entrenas),
+                "t_predice": statistics.mean(t_predices),
+            }
+        )
+    return resultados
+
+
+def imprime_resultados(resultados):
+    columnas = list(PARAMETROS_DEFAULT) + [
+        "acc_media",
+        "acc_std",
+        "t_entrena",
+        "t_predice",
+    ]
+    print("".join(c.center(15) for c in columnas))
+    print("-" * 15 * len(columnas))
+    for r in resultados:
+        print(
+            "".join(
+                (f"{r[c]:.4f}" if isinstance(r[c], float) else f"{r[c]}").center(15)
+                for c in columnas
+            )
+        )
+
+
+def main():
+    datos = [
+        {
+            "atributo1": a1,
+            "atributo2": a2,
+            "clase": "positiva" if a2 != 3 else "negativa",
+        }
+        for a1 in range(1, 5)
+        for a2 in range(1, 5)
+    ]
+    resultados = valida_cruzado(
+        datos,
+        "clase",
+        {"max_profundidad": [1, 2, None], "M": [None, 5]},
+        k=4,
+        semilla=42,
+    )
+    imprime_resultados(resultados)
+    return None
+
+
+if __name__ == "__main__":
+    main()